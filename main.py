@@ -1,27 +1,47 @@
 import argparse
 import asyncio
+import functools
+import logging
 import os
-from dotenv import load_dotenv
+import signal
+import sys
+from collections.abc import Mapping
+from contextlib import suppress
 from datetime import datetime, timedelta
+from pathlib import Path
+from types import MappingProxyType
 from claude_agent_sdk import (
     ClaudeAgentOptions,
     AgentDefinition,
     ClaudeSDKClient,
+    ResultMessage,
     create_sdk_mcp_server,
 )
+from claude_agent_sdk.types import McpSdkServerConfig, McpServerConfig
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; fall back to the stdlib event loop
+    uvloop = None
 
 from servers.config import MCP_SERVERS
 from servers.slack_tools import (
     fetch_messages_from_channel,
-    mark_messages_processed,
     mark_messages_as_processed_sync,
     get_fetched_timestamps,
     clear_fetched_timestamps,
 )
-from servers.github_tools import add_changelog_frontmatter, create_changelog_pr
-from util.messages import display_message
+from servers.github_tools import (
+    add_changelog_frontmatter,
+    check_github_config,
+    create_changelog_pr,
+)
+from util.env import load_env
+from util.lint import lint_changelog
+from util.messages import display_message, should_display
+from util.prompts import load_prompt, preload_prompts
 
-load_dotenv()
+load_env()
 
 
 def parse_args():
@@ -57,24 +77,10 @@ Examples:
 
 # Model configuration
 SLACK_CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID")
-CURRENT_DATE = datetime.now().strftime("%Y-%m-%d")
-# Create SDK MCP server for native tools
-NATIVE_TOOLS_SERVER = create_sdk_mcp_server(
-    name="native_tools",
-    version="1.0.0",
-    tools=[
-        fetch_messages_from_channel,
-        mark_messages_processed,
-        add_changelog_frontmatter,
-        create_changelog_pr,
-    ],
-)
-
-CLI_ARGS = parse_args()
-DEFAULT_DAYS_BACK = CLI_ARGS.days_back
-IGNORE_PROCESSED = CLI_ARGS.ignore_processed
-STRIP_EMOJIS = CLI_ARGS.strip_emojis
+ORCHESTRATOR_MODEL = os.getenv("ORCHESTRATOR_MODEL", "sonnet")
 CHANGELOG_FILE_PATTERN = "./docs/updates/{date}.md"
+DISPLAY_QUEUE_SIZE = 64
+PROMPT_NAMES = ("changelog_writer", "template_formatter", "review_and_feedback")
 
 # Path conventions for media files:
 # - changelog_writer outputs:    ./media/YYYY-MM-DD/filename (relative to changelog)
@@ -83,80 +89,115 @@ CHANGELOG_FILE_PATTERN = "./docs/updates/{date}.md"
 # - Final GitHub location:       docs/images/changelog/YYYY-MM-DD/filename
 
 
-def get_today_changelog_file() -> str:
-    """Get path to today's changelog file."""
-    today = datetime.now().strftime("%Y-%m-%d")
+@functools.cache
+def get_native_tools_server() -> McpSdkServerConfig:
+    """Create the SDK MCP server for native tools once, on first use."""
+    return create_sdk_mcp_server(
+        name="native_tools",
+        version="1.0.0",
+        tools=[
+            fetch_messages_from_channel,
+            add_changelog_frontmatter,
+            lint_changelog,
+        ],
+    )
+
+
+def get_today_changelog_file(today: str) -> str:
+    """Get path to the changelog file for the run's date string (YYYY-MM-DD)."""
     return CHANGELOG_FILE_PATTERN.format(date=today)
 
 
-# Base permissions dictionary - tools and broad access patterns
-permissions = {
-    # Search tools (external lookups)
-    "web_search": "WebSearch",
-    "search_mintlify": "mcp__mintlify__SearchMintlify",
-    "search_replit": "mcp__replit__SearchReplit",
-    # Slack tools (native - via SDK MCP server)
-    "fetch_messages_from_channel": "mcp__native_tools__fetch_messages_from_channel",
-    "mark_messages_processed": "mcp__native_tools__mark_messages_processed",
-    # GitHub tools (native - via SDK MCP server)
-    "add_changelog_frontmatter": "mcp__native_tools__add_changelog_frontmatter",
-    "create_changelog_pr": "mcp__native_tools__create_changelog_pr",
-}
+# Base permissions dictionary - tools and broad access patterns (read-only)
+permissions: Mapping[str, str] = MappingProxyType(
+    {
+        # Search tools (external lookups)
+        "web_search": "WebSearch",
+        "search_mintlify": "mcp__mintlify__SearchMintlify",
+        "search_replit": "mcp__replit__SearchReplit",
+        # Slack tools (native - via SDK MCP server)
+        "fetch_messages_from_channel": "mcp__native_tools__fetch_messages_from_channel",
+        # GitHub tools (native - via SDK MCP server)
+        "add_changelog_frontmatter": "mcp__native_tools__add_changelog_frontmatter",
+        "lint_changelog": "mcp__native_tools__lint_changelog",
+    }
+)
 
 
-def build_permission_groups() -> dict[str, list[str]]:
-    """Build permission groups with today's date.
+# Static, date-independent permissions per agent. Only the changelog file path
+# changes between runs, so build_permission_groups splices it into these.
+# changelog_writer: Fetches Slack messages, creates initial draft
+# NEEDS: Slack fetch, write today's file, search for doc links
+# DOES NOT NEED: read (creating new), edit (not modifying), broad docs access
+_CHANGELOG_WRITER_STATIC = (
+    permissions["fetch_messages_from_channel"],
+    "Skill",
+    permissions["search_replit"],  # Find relevant doc links
+)
+# template_formatter: Reformats draft to match template
+# NEEDS: Read/write/edit today's file, frontmatter tool
+# DOES NOT NEED: Slack, GitHub, search, other files
+_TEMPLATE_FORMATTER_STATIC = (
+    "Skill",
+    permissions["add_changelog_frontmatter"],
+)
+# review_and_feedback: Reviews and fixes issues in changelog
+# NEEDS: Read/edit today's file, lint tool for mechanical checks
+# DOES NOT NEED: Write (edit is sufficient), Slack, GitHub, broad access
+# OPTIONAL: Search tools for verification (keeping for link validation)
+_REVIEW_AND_FEEDBACK_STATIC = (
+    "Skill",
+    permissions["lint_changelog"],
+    permissions["search_replit"],  # Validate doc links
+    permissions["search_mintlify"],  # Validate doc links
+)
+# PR creation is deterministic, so main() calls create_changelog_pr directly
+# after the agents finish instead of routing it through a subagent
+
 
-    Called at runtime to ensure correct date is used.
+@functools.lru_cache(maxsize=1)
+def build_permission_groups(today_file: str) -> Mapping[str, tuple[str, ...]]:
+    """Build permission groups for today's changelog file.
+
+    Called at runtime to ensure correct date is used; cached per path so
+    repeated runs on the same day reuse the same read-only mapping.
     Each agent gets minimum required permissions (principle of least privilege).
     """
-    today_file = get_today_changelog_file()
 
-    return {
-        # changelog_writer: Fetches Slack messages, creates initial draft
-        # NEEDS: Slack fetch, write today's file, search for doc links
-        # DOES NOT NEED: read (creating new), edit (not modifying), broad docs access
-        "changelog_writer": [
-            permissions["fetch_messages_from_channel"],
+    groups = {
+        "changelog_writer": (
             f"Write({today_file})",  # Create new file only
-            "Skill",
-            permissions["search_replit"],  # Find relevant doc links
-        ],
-        # template_formatter: Reformats draft to match template
-        # NEEDS: Read/write/edit today's file, frontmatter tool
-        # DOES NOT NEED: Slack, GitHub, search, other files
-        "template_formatter": [
+            *_CHANGELOG_WRITER_STATIC,
+        ),
+        "template_formatter": (
             f"Read({today_file})",
             f"Write({today_file})",
             f"Edit({today_file})",
-            "Skill",
-            permissions["add_changelog_frontmatter"],
-        ],
-        # review_and_feedback: Reviews and fixes issues in changelog
-        # NEEDS: Read/edit today's file
-        # DOES NOT NEED: Write (edit is sufficient), Slack, GitHub, broad access
-        # OPTIONAL: Search tools for verification (keeping for link validation)
-        "review_and_feedback": [
+            *_TEMPLATE_FORMATTER_STATIC,
+        ),
+        "review_and_feedback": (
             f"Read({today_file})",
             f"Edit({today_file})",
-            "Skill",
-            permissions["search_replit"],  # Validate doc links
-            permissions["search_mintlify"],  # Validate doc links
-        ],
-        # pr_writer: Creates GitHub PR
-        # NEEDS: PR tool, read today's file
-        # DOES NOT NEED: Write/edit (PR tool handles uploads), glob, broad access
-        # NOTE: Message marking is handled automatically by the system after successful completion
-        "pr_writer": [
-            permissions["create_changelog_pr"],
-            "Skill",
-            f"Read({today_file})",
-        ],
+            *_REVIEW_AND_FEEDBACK_STATIC,
+        ),
     }
+    return MappingProxyType(groups)
 
 
-# Build permission groups at module load time
-permission_groups = build_permission_groups()
+def select_mcp_servers(
+    permission_groups: Mapping[str, tuple[str, ...]],
+) -> dict[str, McpServerConfig]:
+    """Return only the MCP servers that some agent's tools actually reference.
+
+    Servers no agent can call are never registered, so they are never connected.
+    """
+    all_servers = {**MCP_SERVERS, "native_tools": get_native_tools_server()}
+    granted = {perm for tools in permission_groups.values() for perm in tools}
+    return {
+        name: config
+        for name, config in all_servers.items()
+        if any(perm.startswith(f"mcp__{name}__") for perm in granted)
+    }
 
 
 USER_PROMPT = """You are the orchestrator for creating and shipping a product changelog.
@@ -170,7 +211,6 @@ You have access to these specialized subagents. Use the Task tool with the EXACT
 | changelog_writer      | Fetch Slack messages and create raw changelog draft  |
 | template_formatter    | Reformat changelog to match template structure       |
 | review_and_feedback   | Review copy/tone/accuracy and fix issues             |
-| pr_writer             | Create GitHub PR with changelog content              |
 
 ## Workflow
 
@@ -178,7 +218,8 @@ Execute these steps in order using the Task tool:
 1. Task(subagent_type="changelog_writer") - Fetches Slack updates and writes ./docs/updates/YYYY-MM-DD.md
 2. Task(subagent_type="template_formatter") - Reformats the file to match template
 3. Task(subagent_type="review_and_feedback") - Reviews and fixes copy issues
-4. Task(subagent_type="pr_writer") - Creates PR with changelog content
+
+The GitHub PR is created automatically by the system after step 3 - do not attempt it.
 
 ## Critical Rules
 
@@ -186,23 +227,36 @@ Execute these steps in order using the Task tool:
 - NEVER use subagent_type="general-purpose" - use the specialized agents
 - Each subagent has its own tools and permissions - do not pass tool instructions
 - Verify each step completes successfully before proceeding to the next
-- Do NOT clone the repository - subagents create files locally and use GitHub MCP for PR
+- Do NOT clone the repository - subagents create files locally
 """
 
 
-def cleanup_existing_changelog() -> None:
-    """Remove today's changelog file and any stray draft files to ensure a clean run."""
-    today_file = get_today_changelog_file()
-    if os.path.exists(today_file):
-        os.remove(today_file)
-        print(f"Removed existing changelog: {today_file}")
+def _remove_file(path: Path) -> bool:
+    """Remove a file with a single unlink, returning whether it existed."""
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
 
+async def cleanup_existing_changelog(changelog_path: str) -> None:
+    """Remove today's changelog file and any stray draft files to ensure a clean run."""
+    today_file = Path(changelog_path)
     # Also remove any incorrectly created draft files
     draft_files = ["draft_changelog.md", "changelog_draft.md", "draft.md"]
-    for draft in draft_files:
-        if os.path.exists(draft):
-            os.remove(draft)
-            print(f"Removed stray draft file: {draft}")
+    paths = [today_file, *map(Path, draft_files)]
+
+    removed = await asyncio.gather(
+        *(asyncio.to_thread(_remove_file, path) for path in paths)
+    )
+    for path, was_removed in zip(paths, removed):
+        if not was_removed:
+            continue
+        if path == today_file:
+            print(f"Removed existing changelog: {path}")
+        else:
+            print(f"Removed stray draft file: {path}")
 
 
 def mark_fetched_messages_as_processed() -> None:
@@ -219,107 +273,192 @@ def mark_fetched_messages_as_processed() -> None:
             print(result["summary"])
 
 
-async def main():
-    # Clean up any existing changelog for today before starting
-    cleanup_existing_changelog()
-    
-    # Clear any stale tracked timestamps from previous runs
-    clear_fetched_timestamps()
+def build_options(
+    today_str: str,
+    window_start: str,
+    changelog_path: str,
+    days_back: int,
+    ignore_processed: bool,
+    strip_emojis: bool,
+) -> ClaudeAgentOptions:
+    """Build the orchestrator options: subagents, permissions, and MCP servers.
 
-    options = ClaudeAgentOptions(
+    This is the single construction path for the agent pipeline.
+    """
+    # Build permission groups at run time so today's date is current
+    permission_groups = build_permission_groups(changelog_path)
+    prompt_values = {
+        "today_str": today_str,
+        "window_start": window_start,
+        "changelog_path": changelog_path,
+        "channel_id": SLACK_CHANNEL_ID,
+        "days_back": days_back,
+        "ignore_processed": ignore_processed,
+        "strip_emojis": strip_emojis,
+    }
+
+    return ClaudeAgentOptions(
         agents={
             "changelog_writer": AgentDefinition(
                 description="Fetch updates from slack, summarize them, and add relevant links + context from the replit documentation and web search",
-                prompt=f"""
-                    Create changelog from Slack updates.
-
-                    Config:
-                    - Time window: {(datetime.now() - timedelta(days=DEFAULT_DAYS_BACK)).strftime('%Y-%m-%d')} to {CURRENT_DATE}
-                    - Channel: {SLACK_CHANNEL_ID}
-
-                    **CRITICAL: You MUST write the output to exactly this path:**
-                    ./docs/updates/{CURRENT_DATE}.md
-
-                    Do NOT write to any other file. Do NOT create draft files.
-
-                    Steps:
-                    1. fetch_messages_from_channel(channel_id, days_back={DEFAULT_DAYS_BACK}, ignore_processed_marker={IGNORE_PROCESSED}, strip_emojis={STRIP_EMOJIS})
-                    2. Write raw content with Slack permalinks per entry to ./docs/updates/{CURRENT_DATE}.md
-
-                    See media-insertion skill for adding images from Slack response.
-                    See brand-writing skill for voice/tone.
-                """,
+                prompt=load_prompt("changelog_writer").format_map(prompt_values),
                 model="sonnet",
-                tools=permission_groups["changelog_writer"],
+                tools=list(permission_groups["changelog_writer"]),
             ),
             "template_formatter": AgentDefinition(
                 description="Reformat changelog content to match the changelog template structure",
-                prompt=f"""
-                    Reformat ./docs/updates/{CURRENT_DATE}.md to match template.
-
-                    Use add_changelog_frontmatter tool for frontmatter.
-                    Follow changelog-formatting skill exactly - it has the complete template, examples, and checklist.
-
-                    Key requirements:
-                    - Remove all Slack links from output
-                    - Remove H1 headings and horizontal rules
-                """,
+                prompt=load_prompt("template_formatter").format_map(prompt_values),
                 model="opus",
-                tools=permission_groups["template_formatter"],
+                tools=list(permission_groups["template_formatter"]),
             ),
             "review_and_feedback": AgentDefinition(
                 description="Use this agent to review copy and provide feedback on the PR",
-                prompt="""
-                    Review changelog against:
-                    - changelog-formatting skill checklist (structure, media, no Slack links)
-                    - brand-writing skill (voice, tone, capitalization)
-
-                    Fix issues directly. Provide line-by-line corrections if needed.
-                """,
-                model="opus",
-                tools=permission_groups["review_and_feedback"],
-            ),
-            "pr_writer": AgentDefinition(
-                description="Draft a PR using our brand guidelines and changelog format",
-                prompt=f"""
-                    1. Read the changelog file to get its content
-                    2. Call create_changelog_pr with these EXACT parameters:
-                       - changelog_path: "./docs/updates/{CURRENT_DATE}.md"
-                       - changelog_content: <the file content you read>
-                       - media_files: []
-                       - pr_title: "Changelog: <formatted date>"
-                       - draft: true
-
-                       **CRITICAL TYPE REQUIREMENTS:**
-                       - media_files MUST be a JSON array: []
-                       - Do NOT pass media_files as a string like "[]" - it must be an actual empty array
-                       - Example correct call: {{"changelog_path": "...", "media_files": [], ...}}
-                       - The tool will auto-discover media files from ./docs/updates/media/{CURRENT_DATE}/
-
-                    Note: Message marking is handled automatically by the system after successful completion.
-                """,
-                model="sonnet",
-                tools=permission_groups["pr_writer"],
+                prompt=load_prompt("review_and_feedback").format_map(prompt_values),
+                model="haiku",
+                tools=list(permission_groups["review_and_feedback"]),
             ),
         },
         system_prompt="You are an expert developer relations professional.",
         permission_mode="bypassPermissions",
-        model="sonnet",
+        model=ORCHESTRATOR_MODEL,
         cwd="./",
         setting_sources=["project"],  # Load Skills from filesystem
         allowed_tools=["Skill"],  # Enable Skill tool
-        mcp_servers={**MCP_SERVERS, "native_tools": NATIVE_TOOLS_SERVER},
+        include_partial_messages=True,  # Stream text deltas as they arrive
+        mcp_servers=select_mcp_servers(permission_groups),
     )
+
+
+async def has_new_messages(
+    days_back: int, ignore_processed: bool, strip_emojis: bool
+) -> bool:
+    """Prefetch the channel and report whether any unprocessed messages exist.
+
+    Errors count as "has messages" so the run proceeds and surfaces them.
+    """
+    result = await fetch_messages_from_channel.handler(
+        {
+            "channel_id": SLACK_CHANNEL_ID,
+            "days_back": days_back,
+            "ignore_processed_marker": ignore_processed,
+            "strip_emojis": strip_emojis,
+        }
+    )
+    if result.get("is_error"):
+        return True
+    return any(get_fetched_timestamps().values())
+
+
+async def ship_changelog_pr(today_str: str, changelog_path: str) -> bool:
+    """Open the changelog PR directly, without an LLM turn.
+
+    Returns True if the PR was created.
+    """
+    display_date = datetime.strptime(today_str, "%Y-%m-%d").strftime("%B %d, %Y")
+    result = await create_changelog_pr.handler(
+        {
+            "changelog_path": changelog_path,
+            "media_files": [],
+            "pr_title": f"Changelog: {display_date}",
+            "draft": True,
+        }
+    )
+    for block in result["content"]:
+        print(block["text"])
+    return not result.get("is_error")
+
+
+async def _drain_messages(queue: asyncio.Queue) -> None:
+    """Display queued messages until a None sentinel is received."""
+    while (message := await queue.get()) is not None:
+        display_message(message)
+
+
+async def _receive_messages(
+    client: ClaudeSDKClient, queue: asyncio.Queue
+) -> ResultMessage | None:
+    """Queue the response stream for display and return its final result."""
+    result = None
+    async for message in client.receive_response():
+        if isinstance(message, ResultMessage):
+            result = message
+        # Drop system and unknown messages before they reach the queue
+        if should_display(message):
+            await queue.put(message)
+    await queue.put(None)
+    return result
+
+
+async def main():
+    args = parse_args()
+    # Fail before any API call rather than sending prompts with "None" in them
+    if not SLACK_CHANNEL_ID:
+        raise ValueError("SLACK_CHANNEL_ID is not set")
+    check_github_config()
+    days_back = args.days_back
+    ignore_processed = args.ignore_processed
+    strip_emojis = args.strip_emojis
+
+    # Compute dates once per run and reuse them everywhere below
+    now = datetime.now()
+    today_str = now.strftime("%Y-%m-%d")
+    window_start = (now - timedelta(days=days_back)).strftime("%Y-%m-%d")
+    changelog_path = get_today_changelog_file(today_str)
+
+    # Clean up any existing changelog for today before starting
+    await cleanup_existing_changelog(changelog_path)
+    
+    # Clear any stale tracked timestamps from previous runs
+    clear_fetched_timestamps()
+
+    # Fetch in Python first: on a quiet window there is nothing to write, so
+    # skip the orchestrator and all subagents. The writer's own fetch later
+    # is served from the same-day fetch cache.
+    if not await has_new_messages(days_back, ignore_processed, strip_emojis):
+        print("No new Slack updates in the time window - skipping changelog run")
+        return
+
+    # build_options is synchronous; read the prompt files before it runs
+    await preload_prompts(*PROMPT_NAMES)
+    options = build_options(
+        today_str,
+        window_start,
+        changelog_path,
+        days_back,
+        ignore_processed,
+        strip_emojis,
+    )
+
+    # SIGINT already cancels the main task under asyncio.Runner; do the same for
+    # SIGTERM so the SDK client and its subprocesses shut down cleanly. Windows
+    # event loops don't support signal handlers, so run without one there.
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    with suppress(NotImplementedError):
+        loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
+
     run_succeeded = False
     try:
         async with ClaudeSDKClient(options=options) as client:
             await client.query(prompt=USER_PROMPT)
 
-            async for message in client.receive_response():
-                display_message(message)
-        
-        # If we get here without exception, the run succeeded
-        run_succeeded = True
+            # Render on a separate task so stdout writes don't stall receiving.
+            # The TaskGroup cancels receiving if rendering fails (and vice
+            # versa) instead of leaving the producer blocked on a full queue.
+            queue: asyncio.Queue = asyncio.Queue(maxsize=DISPLAY_QUEUE_SIZE)
+            async with asyncio.TaskGroup() as tg:
+                receiver = tg.create_task(_receive_messages(client, queue))
+                tg.create_task(_drain_messages(queue))
+            result = receiver.result()
+
+        # Only ship a draft the orchestrator finished cleanly; on max turns, a
+        # failed subagent or an API error the file on disk may be partial
+        if result is None or result.is_error or result.subtype != "success":
+            subtype = result.subtype if result else "no result"
+            print(f"Orchestrator run ended with {subtype} - not creating PR")
+        else:
+            # The agents only write the file; shipping it is a plain tool call
+            run_succeeded = await ship_changelog_pr(today_str, changelog_path)
     finally:
         if run_succeeded:
             # Mark all fetched messages as processed only on success
@@ -329,6 +468,17 @@ async def main():
         
         # Always clear tracked timestamps to prevent cross-run leakage
         clear_fetched_timestamps()
+        with suppress(NotImplementedError):
+            loop.remove_signal_handler(signal.SIGTERM)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
+    except asyncio.CancelledError:
+        # SIGTERM cancelled main(); its finally block has already cleaned up
+        print("Run cancelled by SIGTERM")
+        sys.exit(128 + signal.SIGTERM)
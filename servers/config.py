@@ -1,8 +1,11 @@
 import os
-from dotenv import load_dotenv
 from claude_agent_sdk.types import McpHttpServerConfig
 
-load_dotenv()
+from util.env import load_env
+
+load_env()
+
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 
 # External MCP servers for third-party integrations
 MCP_SERVERS = {
@@ -11,7 +14,7 @@ MCP_SERVERS = {
         url="https://api.githubcopilot.com/mcp/",
         headers={
             "X-MCP-Toolsets": "pull_requests,repos",
-            "Authorization": f"Bearer {os.getenv('GITHUB_TOKEN', '')}",
+            "Authorization": f"Bearer {GITHUB_TOKEN}",
         },
     ),
     "mintlify": McpHttpServerConfig(
@@ -1,14 +1,16 @@
 """Simple, standalone Slack tools for Claude Agent SDK."""
 
+import asyncio
 import hashlib
+import json
 import mimetypes
 import os
+import re
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set
 
-from dotenv import load_dotenv
 from slugify import slugify
 
 import requests
@@ -16,7 +18,11 @@ from claude_agent_sdk import tool
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
-load_dotenv()
+from util.cache import cache_delete_prefix, cache_get, cache_set
+from util.env import load_env
+from util.rate_limit import RateLimiter
+
+load_env()
 
 SLACK_TOKEN = os.getenv("SLACK_TOKEN")
 if not SLACK_TOKEN:
@@ -24,11 +30,30 @@ if not SLACK_TOKEN:
 
 slack_client = WebClient(token=SLACK_TOKEN)
 
+# Slack rate limits are per method. The tier 3 methods used here allow ~50
+# requests per minute, so pace each one to that to avoid 429s and their retry
+# backoff. chat.getPermalink has a much higher limit and is left unpaced.
+SLACK_TIER3_RATE_PER_SECOND = 50 / 60
+SLACK_TIER3_BURST = 20
+history_rate_limiter = RateLimiter(SLACK_TIER3_RATE_PER_SECOND, SLACK_TIER3_BURST)
+replies_rate_limiter = RateLimiter(SLACK_TIER3_RATE_PER_SECOND, SLACK_TIER3_BURST)
+reactions_rate_limiter = RateLimiter(SLACK_TIER3_RATE_PER_SECOND, SLACK_TIER3_BURST)
+
 MAX_FILE_SIZE = 100 * 1024 * 1024
 MEDIA_BASE_DIR = "./docs/updates/media"
 MAX_CONCURRENT_DOWNLOADS = 5
+MAX_CONCURRENT_MESSAGES = 4
+# Shared by every message worker so MAX_CONCURRENT_DOWNLOADS bounds the whole
+# fetch, not each message (each download holds its file in memory)
+download_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="slack-download"
+)
 MAX_TEXT_PREVIEW_LENGTH = 300
 DEFAULT_DAYS_BACK = 7
+FETCH_CACHE_TTL = 3600
+
+EMOJI_SHORTCODE_RE = re.compile(r":[a-zA-Z0-9_+-]+:")
+WHITESPACE_RE = re.compile(r"\s+")
 
 # Module-level tracker for fetched message timestamps
 # Structure: {channel_id: set of timestamps}
@@ -49,11 +74,18 @@ def clear_fetched_timestamps() -> None:
     """Clear all tracked timestamps (call after marking or on failure)."""
     _fetched_timestamps.clear()
 
-import re
+
+def _fetch_cache_key(
+    channel_id: str, days_back: int, ignore_processed: bool, strip_emojis: bool
+) -> str:
+    """Cache key for a channel fetch: one entry per channel, day, and options."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    return f"slack:{channel_id}:{today}:{days_back}:{ignore_processed}:{strip_emojis}"
+
 
 def strip_slack_emojis(text: str) -> str:
     """Remove Slack emoji shortcodes like :tada:, :ship:, :rocket: from text."""
-    return re.sub(r':[a-zA-Z0-9_+-]+:', '', text).strip()
+    return EMOJI_SHORTCODE_RE.sub("", text).strip()
 
 def clean_message_text(text: str, strip_emojis: bool = False) -> str:
     """Clean message text, optionally stripping emoji shortcodes."""
@@ -61,7 +93,7 @@ def clean_message_text(text: str, strip_emojis: bool = False) -> str:
         return ""
     if strip_emojis:
         text = strip_slack_emojis(text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(" ", text).strip()
     return text
 
 
@@ -159,6 +191,7 @@ def download_media_file(
 def get_thread_replies(channel_id: str, thread_ts: str) -> List[Dict]:
     """Fetch all replies in a thread."""
     try:
+        replies_rate_limiter.acquire()
         result = slack_client.conversations_replies(channel=channel_id, ts=thread_ts)
         replies = [msg for msg in result["messages"] if msg["ts"] != thread_ts]
 
@@ -202,37 +235,81 @@ def _download_single_file(file: Dict, skip_existing: bool) -> Optional[Dict]:
     return None
 
 
-def process_message_files(
-    files: List[Dict],
-    skip_existing: bool = True,
-    max_workers: int = MAX_CONCURRENT_DOWNLOADS,
-) -> List[Dict]:
-    """Download and process files attached to a message in parallel."""
+def process_message_files(files: List[Dict], skip_existing: bool = True) -> List[Dict]:
+    """Download and process files attached to a message in parallel.
+
+    Downloads run on the shared download_executor.
+    """
     if not files:
         return []
 
     processed_files = []
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_file = {
-            executor.submit(_download_single_file, file, skip_existing): file
-            for file in files
-        }
+    future_to_file = {
+        download_executor.submit(_download_single_file, file, skip_existing): file
+        for file in files
+    }
 
-        for future in as_completed(future_to_file):
-            try:
-                result = future.result()
-                if result:
-                    processed_files.append(result)
-            except Exception as e:
-                file = future_to_file[future]
-                logger.error(
-                    f"Failed to download file {file.get('name', 'unknown')}: {str(e)}"
-                )
+    for future in as_completed(future_to_file):
+        try:
+            result = future.result()
+            if result:
+                processed_files.append(result)
+        except Exception as e:
+            file = future_to_file[future]
+            logger.error(
+                f"Failed to download file {file.get('name', 'unknown')}: {str(e)}"
+            )
 
     return processed_files
 
 
+def _enrich_message(channel_id: str, msg: Dict, skip_existing: bool) -> Optional[Dict]:
+    """Attach permalink, downloaded files, and thread replies to a message.
+
+    Returns None if Slack rejects the message lookups.
+    """
+    try:
+        permalink_result = slack_client.chat_getPermalink(
+            channel=channel_id, message_ts=msg["ts"]
+        )
+        msg["permalink"] = permalink_result["permalink"]
+
+        if msg.get("files"):
+            msg["processed_files"] = process_message_files(
+                msg["files"], skip_existing=skip_existing
+            )
+
+        if msg.get("thread_ts"):
+            replies = get_thread_replies(channel_id, msg["thread_ts"])
+            for reply in replies:
+                if reply.get("files"):
+                    reply["processed_files"] = process_message_files(
+                        reply["files"], skip_existing=skip_existing
+                    )
+            msg["replies"] = replies
+
+        return msg
+    except SlackApiError:
+        return None
+
+
+def _enrich_messages(
+    channel_id: str, messages: List[Dict], skip_existing: bool
+) -> List[Optional[Dict]]:
+    """Enrich messages concurrently, keeping their order.
+
+    Each message's permalink, media, and thread lookups are independent
+    network round trips. This blocks, so call it off the event loop.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_MESSAGES) as executor:
+        return list(
+            executor.map(
+                lambda msg: _enrich_message(channel_id, msg, skip_existing), messages
+            )
+        )
+
+
 def has_processed_emoji(msg: Dict, emoji_name: str) -> bool:
     """Check if a message has the processed emoji reaction."""
     reactions = msg.get("reactions", [])
@@ -273,6 +350,24 @@ async def fetch_messages_from_channel(args: dict[str, Any]) -> dict[str, Any]:
                 "is_error": True,
             }
 
+        # Reruns on the same day reuse the earlier fetch; media is already on disk
+        cache_key = _fetch_cache_key(
+            channel_id, days_back, ignore_processed_marker, strip_emojis
+        )
+        cached = cache_get(cache_key)
+        if cached:
+            cached_fetch = json.loads(cached)
+            for ts in cached_fetch["timestamps"]:
+                track_fetched_timestamp(channel_id, ts)
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": cached_fetch["summary"],
+                    }
+                ]
+            }
+
         end_time = datetime.now()
         start_time = end_time - timedelta(days=days_back)
 
@@ -282,6 +377,7 @@ async def fetch_messages_from_channel(args: dict[str, Any]) -> dict[str, Any]:
         # Paginate through all messages in the time range
         cursor = None
         while True:
+            await history_rate_limiter.acquire_async()
             result = slack_client.conversations_history(
                 channel=channel_id,
                 oldest=str(start_time.timestamp()),
@@ -297,38 +393,25 @@ async def fetch_messages_from_channel(args: dict[str, Any]) -> dict[str, Any]:
                 break
 
         skipped_processed = 0
+        pending = []
         for msg in all_raw_messages:
             if not ignore_processed_marker and has_processed_emoji(msg, PROCESSED_EMOJI):
                 skipped_processed += 1
                 continue
-                
-            try:
-                permalink_result = slack_client.chat_getPermalink(
-                    channel=channel_id, message_ts=msg["ts"]
-                )
-                msg["permalink"] = permalink_result["permalink"]
-
-                if msg.get("files"):
-                    msg["processed_files"] = process_message_files(
-                        msg["files"], skip_existing=skip_existing
-                    )
-
-                if msg.get("thread_ts"):
-                    replies = get_thread_replies(channel_id, msg["thread_ts"])
-                    for reply in replies:
-                        if reply.get("files"):
-                            reply["processed_files"] = process_message_files(
-                                reply["files"], skip_existing=skip_existing
-                            )
-                    msg["replies"] = replies
-
-                messages.append(msg)
-                
-                # Track this message timestamp for later marking as processed
-                track_fetched_timestamp(channel_id, msg["ts"])
-
-            except SlackApiError:
+            pending.append(msg)
+
+        # The enrichment pool blocks (rate limiter sleeps, downloads), so wait
+        # on it from a worker thread instead of the event loop
+        enriched = await asyncio.to_thread(
+            _enrich_messages, channel_id, pending, skip_existing
+        )
+        for msg in enriched:
+            if msg is None:
                 continue
+            messages.append(msg)
+
+            # Track this message timestamp for later marking as processed
+            track_fetched_timestamp(channel_id, msg["ts"])
 
         summary = f"Fetched {len(messages)} messages from channel {channel_id}\n"
         summary += f"Time range: {start_time.strftime('%Y-%m-%d')} to {end_time.strftime('%Y-%m-%d')}\n"
@@ -403,6 +486,16 @@ async def fetch_messages_from_channel(args: dict[str, Any]) -> dict[str, Any]:
                 if reply_files > 0:
                     summary += f"      Reply files: {reply_files}\n"
 
+        # Only cache fetches that found something: an empty result would keep
+        # answering "no new updates" for the TTL even after new posts land,
+        # and with nothing to mark nothing would ever invalidate it
+        if messages:
+            cached_fetch = {
+                "summary": summary,
+                "timestamps": [msg["ts"] for msg in messages],
+            }
+            cache_set(cache_key, json.dumps(cached_fetch).encode(), FETCH_CACHE_TTL)
+
         return {
             "content": [
                 {
@@ -443,6 +536,7 @@ def mark_messages_as_processed_sync(channel_id: str, timestamps: List[str]) -> D
 
     for ts in timestamps:
         try:
+            reactions_rate_limiter.acquire()
             slack_client.reactions_add(
                 channel=channel_id,
                 name=PROCESSED_EMOJI,
@@ -455,6 +549,10 @@ def mark_messages_as_processed_sync(channel_id: str, timestamps: List[str]) -> D
             else:
                 failed.append({"ts": ts, "error": str(e)})
 
+    # Marked messages drop out of future fetches, so cached fetches are stale
+    if success_count:
+        cache_delete_prefix(f"slack:{channel_id}:")
+
     summary = f"Marked {success_count} messages as processed with :{PROCESSED_EMOJI}:\n"
     if already_reacted > 0:
         summary += f"Skipped {already_reacted} messages (already marked)\n"
@@ -471,55 +569,3 @@ def mark_messages_as_processed_sync(channel_id: str, timestamps: List[str]) -> D
         "failed": failed,
         "summary": summary,
     }
-
-
-@tool(
-    name="mark_messages_processed",
-    description=f"Add a :{PROCESSED_EMOJI}: reaction emoji to Slack messages to mark them as processed. Used for idempotency tracking to avoid re-processing the same messages.",
-    input_schema={
-        "channel_id": str,
-        "message_timestamps": list,
-    },
-)
-async def mark_messages_processed(args: dict[str, Any]) -> dict[str, Any]:
-    """Add reaction emoji to processed Slack messages for idempotency.
-
-    Args:
-        args: Dictionary with:
-            - channel_id: The Slack channel ID
-            - message_timestamps: List of message 'ts' values to mark as processed
-
-    Returns a dictionary with success/failure counts.
-    """
-    try:
-        channel_id = args.get("channel_id")
-        timestamps = args.get("message_timestamps", [])
-
-        if not channel_id:
-            return {
-                "content": [{"type": "text", "text": "Error: channel_id is required"}],
-                "is_error": True,
-            }
-
-        if not timestamps:
-            return {
-                "content": [{"type": "text", "text": "Error: message_timestamps is required and must not be empty"}],
-                "is_error": True,
-            }
-
-        result = mark_messages_as_processed_sync(channel_id, timestamps)
-
-        return {
-            "content": [{"type": "text", "text": result["summary"]}],
-        }
-
-    except SlackApiError as e:
-        return {
-            "content": [{"type": "text", "text": f"Slack API Error: {str(e)}"}],
-            "is_error": True,
-        }
-    except Exception as e:
-        return {
-            "content": [{"type": "text", "text": f"Unexpected error: {str(e)}"}],
-            "is_error": True,
-        }
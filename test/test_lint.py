@@ -0,0 +1,145 @@
+from util.lint import find_changelog_issues
+
+# The changelog-formatting skill's "Correctly Formatted Output" example
+VALID_CHANGELOG = """---
+title: January 15, 2025
+description: 2 min read
+---
+
+## What's new
+
+* [New dashboard](#new-dashboard)
+* [Editor bug fixes](#editor-bug-fixes)
+* [SAML improvements](#saml-improvements)
+
+## Platform
+
+### New dashboard
+
+<Frame>
+  <img src="/images/changelog/2025-01-15/dashboard.png" alt="New dashboard interface" />
+</Frame>
+
+We shipped a new dashboard with improved metrics visibility.
+
+### Editor bug fixes
+
+Fixed several bugs in the editor for a smoother experience.
+
+## Teams and Enterprise
+
+### SAML improvements
+
+SSO setup is now easier with better error messages.
+"""
+
+
+def _with_body(extra: str) -> str:
+    """Append extra content to the end of the valid changelog."""
+    return VALID_CHANGELOG + "\n" + extra + "\n"
+
+
+def _single_issue(content: str) -> str:
+    issues = find_changelog_issues(content)
+    assert len(issues) == 1, issues
+    return issues[0]
+
+
+def test_valid_changelog_passes():
+    assert find_changelog_issues(VALID_CHANGELOG) == []
+
+
+def test_body_link_list_with_dashes_passes():
+    content = _with_body(
+        "Learn more:\n\n"
+        "- [Docs](https://docs.replit.com/replitai/agent)\n"
+        "+ [Blog](https://blog.replit.com/dashboard)"
+    )
+    assert find_changelog_issues(content) == []
+
+
+def test_toc_dash_bullet_fails():
+    content = VALID_CHANGELOG.replace("* [Editor bug fixes]", "- [Editor bug fixes]")
+    assert _single_issue(content) == (
+        "TOC bullets must use '*' instead of '-' or '+' (line 9)"
+    )
+
+
+def test_toc_plus_bullet_fails():
+    content = VALID_CHANGELOG.replace("* [New dashboard]", "+ [New dashboard]")
+    assert "TOC bullets" in _single_issue(content)
+
+
+def test_toc_as_last_section_is_checked():
+    content = "---\ntitle: January 15, 2025\ndescription: 1 min read\n---\n\n"
+    content += "## What's new\n\n- [Only item](#only-item)\n"
+    assert _single_issue(content).endswith("(line 8)")
+
+
+def test_missing_frontmatter_fails():
+    content = VALID_CHANGELOG.split("---\n", 2)[2]
+    assert "Frontmatter" in _single_issue(content)
+
+
+def test_malformed_frontmatter_title_fails():
+    content = VALID_CHANGELOG.replace("January 15, 2025", "2025-01-15")
+    assert "Frontmatter" in _single_issue(content)
+
+
+def test_missing_whats_new_fails():
+    content = VALID_CHANGELOG.replace("## What's new", "## Highlights")
+    assert _single_issue(content) == "Missing '## What's new' section"
+
+
+def test_duplicate_section_fails():
+    content = _with_body("## Platform\n\n### Another feature")
+    assert _single_issue(content) == "Duplicate section headers: Platform"
+
+
+def test_h1_heading_fails():
+    content = VALID_CHANGELOG.replace(
+        "## What's new", "# Changelog: January 15, 2025\n\n## What's new"
+    )
+    assert _single_issue(content).startswith("H1 heading found")
+
+
+def test_horizontal_rule_fails():
+    content = VALID_CHANGELOG.replace(
+        "## Teams and Enterprise", "---\n\n## Teams and Enterprise"
+    )
+    assert _single_issue(content) == "Horizontal rule (---) found outside frontmatter"
+
+
+def test_markdown_image_fails():
+    content = _with_body("![Dashboard](/images/changelog/2025-01-15/dashboard.png)")
+    assert _single_issue(content).startswith("Markdown image syntax remains")
+
+
+def test_local_media_path_fails():
+    content = VALID_CHANGELOG.replace(
+        "/images/changelog/2025-01-15/", "./media/2025-01-15/"
+    )
+    assert _single_issue(content) == (
+        "Local media path found; use /images/changelog/YYYY-MM-DD/ (line 17)"
+    )
+
+
+def test_slack_link_fails():
+    content = _with_body(
+        "[Slack announcement](https://replit.slack.com/archives/C123/p456)"
+    )
+    assert _single_issue(content).startswith("Slack link found")
+
+
+def test_unframed_media_fails():
+    content = _with_body(
+        '<video src="/images/changelog/2025-01-15/demo.mp4" controls />'
+    )
+    assert _single_issue(content) == "Media tag found without a <Frame> wrapper"
+
+
+def test_line_numbers_are_capped():
+    content = _with_body(
+        "\n".join(f"[Slack](https://replit.slack.com/archives/{i})" for i in range(7))
+    )
+    assert _single_issue(content).endswith("and 2 more)")
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+CACHE_DB_PATH = os.path.join(".cache", "mcp_cache.sqlite3")
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Open the cache database, commit on success, and always close it."""
+    os.makedirs(os.path.dirname(CACHE_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB_PATH)
+    try:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS mcp_cache "
+                "(key TEXT PRIMARY KEY, value BLOB, expires_at INT)"
+            )
+            yield conn
+    finally:
+        conn.close()
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached value for key, or None if missing or expired."""
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT value FROM mcp_cache WHERE key = ? AND expires_at > ?",
+            (key, int(time.time())),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def cache_set(key: str, value: bytes, ttl: int) -> None:
+    """Store value under key for ttl seconds."""
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO mcp_cache (key, value, expires_at) "
+            "VALUES (?, ?, ?)",
+            (key, value, int(time.time()) + ttl),
+        )
+
+
+def cache_delete_prefix(prefix: str) -> None:
+    """Drop every cached entry whose key starts with prefix."""
+    with _connect() as conn:
+        conn.execute(
+            "DELETE FROM mcp_cache WHERE substr(key, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
@@ -0,0 +1,18 @@
+import os
+
+from dotenv import load_dotenv
+
+ENV_LOADED_FLAG = "_ENV_LOADED"
+
+
+def load_env() -> None:
+    """Load .env into os.environ once per process.
+
+    Sets a sentinel variable after loading so later calls (and child
+    processes) skip re-reading the file. Deployed containers can set
+    _ENV_LOADED=1 to skip .env parsing entirely.
+    """
+    if os.getenv(ENV_LOADED_FLAG):
+        return
+    load_dotenv()
+    os.environ[ENV_LOADED_FLAG] = "1"
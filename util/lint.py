@@ -0,0 +1,155 @@
+import asyncio
+import re
+from pathlib import Path
+from typing import Any, Dict
+
+from claude_agent_sdk import tool
+
+# Mechanical checks from the changelog-formatting skill checklist. These are
+# deterministic, so they run as code instead of as reviewer model instructions.
+FRONTMATTER_TITLE_RE = re.compile(
+    r"^---\ntitle: [A-Z][a-z]+ \d{1,2}, \d{4}\ndescription: .+\n---$", re.M
+)
+WHATS_NEW_RE = re.compile(r"^## What's new$", re.M)
+NEXT_SECTION_RE = re.compile(r"^## ", re.M)
+H1_HEADING_RE = re.compile(r"^# ", re.M)
+SECTION_HEADING_RE = re.compile(r"^## (.+?)\s*$", re.M)
+HORIZONTAL_RULE_RE = re.compile(r"^---$", re.M)
+MARKDOWN_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+NON_STAR_BULLET_RE = re.compile(r"^[-+] \[", re.M)
+LOCAL_MEDIA_PATH_RE = re.compile(r"\./(?:docs/updates/)?media/")
+SLACK_LINK_RE = re.compile(r"https?://[\w.-]*slack\.com/")
+UNFRAMED_MEDIA_RE = re.compile(r"<(?:img|video)\b")
+FRAME_OPEN_RE = re.compile(r"<Frame>")
+
+
+MAX_REPORTED_LINES = 5
+
+
+def _whats_new_span(content: str) -> tuple[int, int]:
+    """Return the (start, end) offsets of the What's new section body.
+
+    The section runs from its heading to the next '## ' heading or the end of
+    the file; (0, 0) if there is no What's new section.
+    """
+    heading = WHATS_NEW_RE.search(content)
+    if not heading:
+        return 0, 0
+    next_section = NEXT_SECTION_RE.search(content, heading.end())
+    return heading.end(), next_section.start() if next_section else len(content)
+
+
+def _at_lines(
+    pattern: re.Pattern, content: str, start: int = 0, end: int | None = None
+) -> str:
+    """Format the line numbers where pattern matches, e.g. ' (lines 3, 9)'.
+
+    start/end restrict the search to content[start:end]; line numbers are
+    still counted from the top of the file.
+    """
+    end = len(content) if end is None else end
+    lines = [
+        content.count("\n", 0, m.start()) + 1
+        for m in pattern.finditer(content, start, end)
+    ]
+    if not lines:
+        return ""
+    shown = ", ".join(str(line) for line in lines[:MAX_REPORTED_LINES])
+    if len(lines) > MAX_REPORTED_LINES:
+        shown += f" and {len(lines) - MAX_REPORTED_LINES} more"
+    return f" (line{'s' if len(lines) > 1 else ''} {shown})"
+
+
+def find_changelog_issues(content: str) -> list[str]:
+    """Check changelog content against the mechanical formatting rules.
+
+    Returns a list of human-readable issues with line numbers where they
+    apply, so the reviewer can go straight to them; empty if content passes.
+    """
+    issues = []
+    if not FRONTMATTER_TITLE_RE.search(content):
+        issues.append(
+            "Frontmatter missing or malformed (expected title as 'Month DD, YYYY')"
+        )
+    if not WHATS_NEW_RE.search(content):
+        issues.append("Missing '## What's new' section")
+    sections = SECTION_HEADING_RE.findall(content)
+    duplicates = sorted({name for name in sections if sections.count(name) > 1})
+    if duplicates:
+        issues.append(f"Duplicate section headers: {', '.join(duplicates)}")
+    if H1_HEADING_RE.search(content):
+        issues.append(
+            "H1 heading found; use ## and ### headings only"
+            + _at_lines(H1_HEADING_RE, content)
+        )
+    # Two '---' lines belong to the frontmatter; any more are horizontal rules
+    if len(HORIZONTAL_RULE_RE.findall(content)) > 2:
+        issues.append("Horizontal rule (---) found outside frontmatter")
+    if MARKDOWN_IMAGE_RE.search(content):
+        issues.append(
+            "Markdown image syntax remains; wrap media in <Frame> tags"
+            + _at_lines(MARKDOWN_IMAGE_RE, content)
+        )
+    # The '*' bullet rule only covers the TOC; body lists may use any marker
+    toc_start, toc_end = _whats_new_span(content)
+    if NON_STAR_BULLET_RE.search(content, toc_start, toc_end):
+        issues.append(
+            "TOC bullets must use '*' instead of '-' or '+'"
+            + _at_lines(NON_STAR_BULLET_RE, content, toc_start, toc_end)
+        )
+    if LOCAL_MEDIA_PATH_RE.search(content):
+        issues.append(
+            "Local media path found; use /images/changelog/YYYY-MM-DD/"
+            + _at_lines(LOCAL_MEDIA_PATH_RE, content)
+        )
+    if SLACK_LINK_RE.search(content):
+        issues.append(
+            "Slack link found; remove all Slack links"
+            + _at_lines(SLACK_LINK_RE, content)
+        )
+    media_tags = len(UNFRAMED_MEDIA_RE.findall(content))
+    if media_tags > len(FRAME_OPEN_RE.findall(content)):
+        issues.append("Media tag found without a <Frame> wrapper")
+    return issues
+
+
+@tool(
+    name="lint_changelog",
+    description="Check the changelog file at changelog_path against the mechanical formatting rules (frontmatter, What's new section, headings, horizontal rules, Frame-wrapped media, CDN paths, bullet style, no Slack links). Returns a list of issues to fix, or confirms the file passes.",
+    input_schema={
+        "changelog_path": str,
+    },
+)
+async def lint_changelog(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Run deterministic formatting checks on a changelog file.
+
+    Reads the file itself so the model never has to echo the changelog back
+    as tool-call arguments.
+
+    Args:
+        args: Dictionary with 'changelog_path' (local path to the changelog)
+
+    Returns the list of formatting issues found, if any.
+    """
+    changelog_path = args.get("changelog_path", "")
+    if not changelog_path:
+        return {
+            "content": [{"type": "text", "text": "Error: changelog_path is required"}],
+            "is_error": True,
+        }
+    try:
+        content = await asyncio.to_thread(Path(changelog_path).read_text)
+    except OSError as e:
+        return {
+            "content": [{"type": "text", "text": f"Error reading changelog file: {e}"}],
+            "is_error": True,
+        }
+
+    issues = find_changelog_issues(content)
+    if not issues:
+        text = "No formatting issues found"
+    else:
+        text = f"Found {len(issues)} formatting issues:\n" + "\n".join(
+            f"- {issue}" for issue in issues
+        )
+    return {"content": [{"type": "text", "text": text}]}
@@ -0,0 +1,40 @@
+import os
+import re
+
+# Local markdown media references as written by changelog_writer, e.g.
+# ![alt](./media/2025-01-15/demo.mp4) or ![alt](./docs/updates/media/...)
+LOCAL_MEDIA_REF_RE = re.compile(
+    r"!\[([^\]]*)\]\(\./(?:docs/updates/)?media/([^)\s]+)\)"
+)
+CDN_MEDIA_PREFIX = "/images/changelog/"
+
+# Extension -> tag template for the changelog-formatting skill's Frame blocks
+MEDIA_TAGS = {
+    ".png": '<img src="{src}" alt="{alt}" />',
+    ".jpg": '<img src="{src}" alt="{alt}" />',
+    ".jpeg": '<img src="{src}" alt="{alt}" />',
+    ".gif": '<img src="{src}" alt="{alt}" />',
+    ".webp": '<img src="{src}" alt="{alt}" />',
+    ".mp4": '<video src="{src}" controls />',
+    ".mov": '<video src="{src}" controls />',
+    ".webm": '<video src="{src}" controls />',
+}
+
+
+def _frame(match: re.Match) -> str:
+    alt, media_path = match.groups()
+    tag = MEDIA_TAGS.get(os.path.splitext(media_path)[1].lower())
+    if tag is None:
+        return match.group(0)
+    src = CDN_MEDIA_PREFIX + media_path
+    alt = alt.replace('"', "&quot;")
+    return f"<Frame>\n  {tag.format(src=src, alt=alt)}\n</Frame>"
+
+
+def frame_media(content: str) -> str:
+    """Convert local markdown media references into Frame-wrapped CDN tags.
+
+    Images become <img> and videos become <video controls>, chosen by file
+    extension; references with unknown extensions are left untouched.
+    """
+    return LOCAL_MEDIA_REF_RE.sub(_frame, content)
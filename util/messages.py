@@ -1,39 +1,89 @@
 from claude_agent_sdk import (
     AssistantMessage,
     ResultMessage,
+    StreamEvent,
     SystemMessage,
     TextBlock,
     ToolResultBlock,
     ToolUseBlock,
     UserMessage,
 )
-from typing import Union
+from typing import Any, Callable, Union
+
+
+def _display_user(msg: UserMessage) -> None:
+    for block in msg.content:
+        if isinstance(block, TextBlock):
+            print(f"User: {block.text}")
+        elif isinstance(block, ToolResultBlock):
+            print(f"Tool Result: {block.content[:100] if block.content else 'None'}...")
+
+
+# Whether text for the current assistant turn was already printed from
+# partial stream events, so the consolidated AssistantMessage can skip it.
+_stream_state = {"in_text_block": False, "text_streamed": False}
+
+
+def _display_stream_event(msg: StreamEvent) -> None:
+    event = msg.event
+    event_type = event.get("type")
+    if event_type == "content_block_start":
+        if event.get("content_block", {}).get("type") == "text":
+            _stream_state["in_text_block"] = True
+            print("Claude: ", end="", flush=True)
+    elif event_type == "content_block_delta" and _stream_state["in_text_block"]:
+        delta = event.get("delta", {})
+        if delta.get("type") == "text_delta":
+            print(delta.get("text", ""), end="", flush=True)
+            _stream_state["text_streamed"] = True
+    elif event_type == "content_block_stop" and _stream_state["in_text_block"]:
+        _stream_state["in_text_block"] = False
+        print()
+
+
+def _display_assistant(msg: AssistantMessage) -> None:
+    text_streamed = _stream_state["text_streamed"]
+    _stream_state["text_streamed"] = False
+    for block in msg.content:
+        if isinstance(block, TextBlock):
+            if not text_streamed:
+                print(f"Claude: {block.text}")
+        elif isinstance(block, ToolUseBlock):
+            print(f"Using tool: {block.name}")
+            if block.input:
+                print(f"  Input: {block.input}")
+
+
+def _display_result(msg: ResultMessage) -> None:
+    print("Result ended")
+    if msg.total_cost_usd:
+        print(f"Cost: ${msg.total_cost_usd:.6f}")
+
+
+def _display_nothing(msg: Any) -> None:
+    pass
+
+
+# Exact-type dispatch: one dict lookup per streamed message instead of an
+# isinstance chain. SystemMessage and unknown types are silently skipped.
+_HANDLERS: dict[type, Callable[[Any], None]] = {
+    UserMessage: _display_user,
+    AssistantMessage: _display_assistant,
+    SystemMessage: _display_nothing,
+    ResultMessage: _display_result,
+    StreamEvent: _display_stream_event,
+}
+
+
+def should_display(msg: Any) -> bool:
+    """Return whether display_message would render anything for this message."""
+    return _HANDLERS.get(type(msg), _display_nothing) is not _display_nothing
 
 
 def display_message(
-    msg: Union[UserMessage, AssistantMessage, SystemMessage, ResultMessage],
+    msg: Union[
+        UserMessage, AssistantMessage, SystemMessage, ResultMessage, StreamEvent
+    ],
 ) -> None:
     """Display message content in a clean format."""
-
-    if isinstance(msg, UserMessage):
-        for block in msg.content:
-            if isinstance(block, TextBlock):
-                print(f"User: {block.text}")
-            elif isinstance(block, ToolResultBlock):
-                print(
-                    f"Tool Result: {block.content[:100] if block.content else 'None'}..."
-                )
-    elif isinstance(msg, AssistantMessage):
-        for block in msg.content:
-            if isinstance(block, TextBlock):
-                print(f"Claude: {block.text}")
-            elif isinstance(block, ToolUseBlock):
-                print(f"Using tool: {block.name}")
-                if block.input:
-                    print(f"  Input: {block.input}")
-    elif isinstance(msg, SystemMessage):
-        pass
-    elif isinstance(msg, ResultMessage):
-        print("Result ended")
-        if msg.total_cost_usd:
-            print(f"Cost: ${msg.total_cost_usd:.6f}")
+    _HANDLERS.get(type(msg), _display_nothing)(msg)
@@ -0,0 +1,23 @@
+import asyncio
+import functools
+from pathlib import Path
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+@functools.cache
+def load_prompt(name: str) -> str:
+    """Read a subagent prompt template from prompts/<name>.md once per process.
+
+    Templates keep run-specific values in a trailing "Run config" block so the
+    instruction prefix is byte-identical across runs.
+    """
+    return (PROMPTS_DIR / f"{name}.md").read_text()
+
+
+async def preload_prompts(*names: str) -> None:
+    """Warm the load_prompt cache on worker threads, reading files concurrently.
+
+    Await this before building agent options so the reads never block the loop.
+    """
+    await asyncio.gather(*(asyncio.to_thread(load_prompt, name) for name in names))
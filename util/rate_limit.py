@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket for pacing outbound API calls.
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    acquire() blocks until a token is available, so bursts are allowed up to
+    the bucket size and sustained traffic is held at the refill rate. Use
+    acquire_async() from coroutines so the wait doesn't stall the event loop.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """Take a token if one is available; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while wait := self._try_take():
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Take one token, awaiting asyncio.sleep until one is available."""
+        while wait := self._try_take():
+            await asyncio.sleep(wait)